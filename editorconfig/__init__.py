@@ -1,20 +1,32 @@
 """EditorConfig Python Core"""
 
 from collections import OrderedDict
+from typing import Optional
 
+from editorconfig.loaders import EditorConfigLoader
 from editorconfig.versiontools import join_version
 from editorconfig.version import VERSION
 
-__all__ = ['get_properties', 'EditorConfigError', 'exceptions']
+__all__ = ['get_properties', 'get_property', 'Resolver', 'EditorConfigError',
+           'exceptions']
 
 __version__ = join_version(VERSION)
 
 
-def get_properties(filename: str) -> OrderedDict[str, str]:
+def get_properties(filename: str, loader: Optional[EditorConfigLoader] = None
+                   ) -> OrderedDict[str, str]:
     """Locate and parse EditorConfig files for the given filename"""
-    handler = EditorConfigHandler(filename)
+    handler = EditorConfigHandler(filename, loader=loader)
     return handler.get_configurations()
 
 
+def get_property(filename: str, name: str,
+                 loader: Optional[EditorConfigLoader] = None) -> Optional[str]:
+    """Return value of a single EditorConfig property for the given filename"""
+    handler = EditorConfigHandler(filename, loader=loader)
+    return handler.get_property(name)
+
+
 from editorconfig.handler import EditorConfigHandler
+from editorconfig.resolver import Resolver
 from editorconfig.exceptions import *
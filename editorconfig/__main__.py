@@ -5,13 +5,20 @@ Licensed under Simplified BSD License (see LICENSE.BSD file).
 """
 
 import getopt
+import json
+import os
 import sys
+from collections.abc import Iterator
+from typing import Optional
 
 from editorconfig import __version__
+from editorconfig.checker import check_files
+from editorconfig.columnar import get_columnar_properties
 from editorconfig.exceptions import ParsingError, PathError, VersionError
-from editorconfig.handler import EditorConfigHandler
+from editorconfig.impact import get_changed_paths
+from editorconfig.resolver import Resolver
 from editorconfig.version import VERSION
-from editorconfig.versiontools import split_version
+from editorconfig.versiontools import VersionTuple, split_version
 
 
 def version() -> None:
@@ -28,15 +35,96 @@ def usage(command: str, error: bool = False) -> None:
               'Specify conf filename other than ".editorconfig".\n')
     out.write("-b                 "
               "Specify version (used by devs to test compatibility).\n")
+    out.write("--ceiling=DIR      "
+              "Do not search for conf files above DIR (may be repeated).\n")
+    out.write("--stop-at-repo-root\n"
+              "                   "
+              "Do not search for conf files above a git repository root.\n")
+    out.write("--check            "
+              "Check files against their properties and print violations\n"
+              "                   "
+              "as JSON lines, searching directories given as FILENAME.\n")
+    out.write("-j N OR --jobs=N   "
+              "Number of worker processes checking files (with --check).\n")
+    out.write("--csv              "
+              "Print properties as CSV with one column per property,\n"
+              "                   "
+              "searching directories given as FILENAME.\n")
+    out.write("--impact=CONF      "
+              "Print files whose properties differ between two versions\n"
+              "                   "
+              "of CONF, searching directories given as FILENAME.\n")
+    out.write("--old=FILE         "
+              "Read the old version of CONF from FILE (with --impact).\n")
+    out.write("--new=FILE         "
+              "Read the new version of CONF from FILE (with --impact,\n"
+              "                   defaults to CONF).\n")
     out.write("-h OR --help       Print this help message.\n")
     out.write("-v OR --version    Display version information.\n")
 
 
+def read_conf(filename: str) -> str:
+    try:
+        with open(filename, encoding='utf-8', mode='r') as fp:
+            return fp.read()
+    except OSError as e:
+        sys.exit(str(e))
+
+
+def walk_files(filenames: list[str]) -> Iterator[str]:
+    for filename in filenames:
+        if os.path.isdir(filename):
+            for dirpath, dirnames, files in os.walk(filename):
+                dirnames[:] = sorted(name for name in dirnames
+                                     if name != '.git')
+                for name in sorted(files):
+                    yield os.path.join(dirpath, name)
+        else:
+            yield filename
+
+
+def impact(conf: str, old_conf: str, new_conf: str, filenames: list[str],
+           version_tuple: VersionTuple, ceiling_dirs: Optional[list[str]],
+           stop_at_repo_root: bool) -> None:
+    conf = os.path.abspath(conf)
+    filenames = list(walk_files([os.path.abspath(name)
+                                 for name in filenames]))
+    try:
+        changed = get_changed_paths(conf, read_conf(old_conf),
+                                    read_conf(new_conf), filenames,
+                                    version=version_tuple,
+                                    ceiling_directories=ceiling_dirs,
+                                    stop_at_repository_root=stop_at_repo_root)
+    except (ParsingError, PathError, VersionError) as e:
+        print(str(e))
+        sys.exit(2)
+    for filename in changed:
+        print(filename)
+
+
+def check(resolver: Resolver, filenames: list[str],
+          workers: Optional[int]) -> None:
+    found = False
+    paths = walk_files([os.path.abspath(name) for name in filenames])
+    try:
+        for violation in check_files(paths, resolver, workers):
+            found = True
+            print(json.dumps(violation._asdict()), flush=True)
+    except ParsingError as e:
+        print(str(e))
+        sys.exit(2)
+    if found:
+        sys.exit(1)
+
+
 def main() -> None:
     command_name = sys.argv[0]
     try:
         opts, args = getopt.getopt(sys.argv[1:],
-                                   "vhb:f:", ["version", "help"])
+                                   "vhb:f:j:", ["version", "help", "impact=",
+                                              "old=", "new=", "ceiling=",
+                                              "stop-at-repo-root", "check",
+                                              "jobs=", "csv"])
     except getopt.GetoptError as e:
         print(str(e))
         usage(command_name, error=True)
@@ -44,6 +132,14 @@ def main() -> None:
 
     version_tuple = VERSION
     conf_filename = '.editorconfig'
+    impact_conf = None
+    old_conf = None
+    new_conf = None
+    ceiling_dirs: Optional[list[str]] = None
+    stop_at_repo_root = False
+    check_mode = False
+    csv_mode = False
+    workers = None
 
     for option, arg in opts:
         if option in ('-h', '--help'):
@@ -59,6 +155,29 @@ def main() -> None:
             if arg_tuple is None:
                 sys.exit("Invalid version number: %s" % arg)
             version_tuple = arg_tuple
+        if option == '--ceiling':
+            if ceiling_dirs is None:
+                ceiling_dirs = []
+            ceiling_dirs.append(os.path.abspath(arg))
+        if option == '--stop-at-repo-root':
+            stop_at_repo_root = True
+        if option == '--check':
+            check_mode = True
+        if option == '--csv':
+            csv_mode = True
+        if option in ('-j', '--jobs'):
+            try:
+                workers = int(arg)
+            except ValueError:
+                workers = 0
+            if workers < 1:
+                sys.exit("Invalid number of jobs: %s" % arg)
+        if option == '--impact':
+            impact_conf = arg
+        if option == '--old':
+            old_conf = arg
+        if option == '--new':
+            new_conf = arg
 
     if len(args) < 1:
         usage(command_name, error=True)
@@ -66,11 +185,40 @@ def main() -> None:
     filenames = args
     multiple_files = len(args) > 1
 
+    if impact_conf is not None:
+        if old_conf is None:
+            usage(command_name, error=True)
+            sys.exit(2)
+        impact(impact_conf, old_conf, new_conf or impact_conf, filenames,
+               version_tuple, ceiling_dirs, stop_at_repo_root)
+        return
+
+    try:
+        resolver = Resolver(conf_filename, version_tuple,
+                            ceiling_directories=ceiling_dirs,
+                            stop_at_repository_root=stop_at_repo_root)
+    except VersionError as e:
+        print(str(e))
+        sys.exit(2)
+
+    if check_mode:
+        check(resolver, filenames, workers)
+        return
+
+    if csv_mode:
+        paths = walk_files([os.path.abspath(name) for name in filenames])
+        try:
+            properties = get_columnar_properties(paths, resolver)
+        except ParsingError as e:
+            print(str(e))
+            sys.exit(2)
+        properties.write_csv(sys.stdout)
+        return
+
     for filename in filenames:
-        handler = EditorConfigHandler(filename, conf_filename, version_tuple)
         try:
-            options = handler.get_configurations()
-        except (ParsingError, PathError, VersionError) as e:
+            options = resolver.resolve(filename)
+        except (ParsingError, PathError) as e:
             print(str(e))
             sys.exit(2)
         if multiple_files:
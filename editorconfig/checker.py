@@ -0,0 +1,273 @@
+"""EditorConfig conformance checker
+
+Provides ``check_file`` and ``check_files`` for verifying that file
+contents follow their EditorConfig properties.  Files are memory-mapped
+and scanned with byte-level regular expressions, so no file is decoded
+or split into lines in Python.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import codecs
+import mmap
+import os
+import re
+import stat
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import (Executor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor)
+from typing import NamedTuple, Optional, Union
+
+from editorconfig.resolver import Resolver, default_resolver
+
+
+__all__ = ['Violation', 'check_file', 'check_files']
+
+
+class Violation(NamedTuple):
+
+    """
+    Single property violation found in a file
+
+    ``line`` is the 1-based line of the first offending byte, or ``None``
+    if the violation concerns the file as a whole.  Errors reading the
+    file, and paths that are not regular files, are reported with
+    ``property`` set to ``None``.
+
+    """
+
+    path: str
+    property: Optional[str]
+    value: Optional[str]
+    line: Optional[int]
+    message: str
+
+
+_EOL_RE = {
+    "lf": (re.compile(rb"\r"), "line does not end with LF"),
+    "crlf": (re.compile(rb"\r(?!\n)|(?<!\r)\n"),
+             "line does not end with CRLF"),
+    "cr": (re.compile(rb"\n"), "line does not end with CR"),
+}
+
+# Matching the last whitespace byte of a line is enough to report it, and
+# avoids rescanning a run of spaces from each of its bytes
+_TRAILING_WHITESPACE_RE = re.compile(rb"[ \t][\r\n]")
+
+_INDENT_PATTERNS = {
+    # Allow a single space before ``*`` continuing a block comment
+    "tab": (rb"(?! \*) +(?=[^ \r\n])", "line is indented with spaces"),
+    "space": (rb" *\t", "line is indented with tabs"),
+}
+
+# Patterns are matched at the start of the data and searched after every
+# CR or LF, as ``(?m)^`` only starts lines after LF
+_INDENT_RE = {
+    style: (re.compile(pattern), re.compile(rb"[\r\n](?:%s)" % pattern),
+            message)
+    for style, (pattern, message) in _INDENT_PATTERNS.items()
+}
+
+_NON_ASCII_RE = re.compile(rb"[\x80-\xff]")
+
+_UTF8_BOM = codecs.BOM_UTF8
+
+_CHUNK_SIZE = 1 << 20
+
+# Files sent to a worker at once, to amortize passing them between processes
+_BATCH_SIZE = 64
+
+_Buffer = Union[bytes, mmap.mmap]
+
+
+def _line(data: _Buffer, offset: int, newline: bytes) -> int:
+    return data[:offset].count(newline) + 1
+
+
+def _find_trailing_whitespace(data: _Buffer) -> Optional[int]:
+    """Return offset of whitespace ending a line, or None"""
+    match = _TRAILING_WHITESPACE_RE.search(data)
+    if match:
+        return match.start()
+    if data[-1:] in (b" ", b"\t"):
+        return len(data) - 1
+    return None
+
+
+def _find_invalid_utf8(data: _Buffer, start: int) -> Optional[int]:
+    """Return offset of first byte that is not valid UTF-8, or None"""
+    match = _NON_ASCII_RE.search(data, start)
+    if match is None:
+        return None
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    offset = match.start()
+    with memoryview(data) as view:
+        while offset < len(data):
+            # Bytes of a sequence split across chunks stay in the decoder
+            buffered = len(decoder.getstate()[0])
+            with view[offset:offset + _CHUNK_SIZE] as chunk:
+                try:
+                    decoder.decode(chunk,
+                                   final=offset + len(chunk) >= len(data))
+                except UnicodeDecodeError as e:
+                    return offset - buffered + e.start
+            offset += _CHUNK_SIZE
+    return None
+
+
+def _check_data(path: str, data: _Buffer, options: Mapping[str, str]
+                ) -> Iterator[Violation]:
+    eol = options.get("end_of_line")
+    newline = b"\r" if eol == "cr" else b"\n"
+    if eol in _EOL_RE:
+        regex, message = _EOL_RE[eol]
+        match = regex.search(data)
+        if match:
+            yield Violation(path, "end_of_line", eol,
+                            _line(data, match.start(), newline), message)
+
+    final_newline = options.get("insert_final_newline")
+    if len(data) and final_newline in ("true", "false"):
+        has_newline = data[-1:] in (b"\r", b"\n")
+        if final_newline == "true" and not has_newline:
+            yield Violation(path, "insert_final_newline", final_newline,
+                            None, "file does not end with a newline")
+        elif final_newline == "false" and has_newline:
+            yield Violation(path, "insert_final_newline", final_newline,
+                            None, "file ends with a newline")
+
+    if options.get("trim_trailing_whitespace") == "true":
+        offset = _find_trailing_whitespace(data)
+        if offset is not None:
+            yield Violation(path, "trim_trailing_whitespace", "true",
+                            _line(data, offset, newline),
+                            "line has trailing whitespace")
+
+    style = options.get("indent_style")
+    if style in _INDENT_RE:
+        first_line, other_lines, message = _INDENT_RE[style]
+        match = first_line.match(data) or other_lines.search(data)
+        if match:
+            # Matches after the first line start with the line terminator
+            offset = match.start() + (match.re is other_lines)
+            yield Violation(path, "indent_style", style,
+                            _line(data, offset, newline), message)
+
+    charset = options.get("charset")
+    if charset in ("utf-8", "utf-8-bom"):
+        has_bom = data[:3] == _UTF8_BOM
+        if charset == "utf-8" and has_bom:
+            yield Violation(path, "charset", charset, None,
+                            "file starts with a UTF-8 byte order mark")
+        elif charset == "utf-8-bom" and not has_bom:
+            yield Violation(path, "charset", charset, None,
+                            "file does not start with a UTF-8 byte order "
+                            "mark")
+        offset = _find_invalid_utf8(data, 3 if has_bom else 0)
+        if offset is not None:
+            yield Violation(path, "charset", charset,
+                            _line(data, offset, newline),
+                            "file is not valid UTF-8")
+    elif charset in ("utf-16be", "utf-16le") and len(data) % 2:
+        yield Violation(path, "charset", charset, None,
+                        "file has an odd number of bytes")
+
+
+def check_file(path: str, options: Mapping[str, str]) -> list[Violation]:
+
+    """
+    Return violations of EditorConfig options found in file at path
+
+    Checks ``end_of_line``, ``insert_final_newline``,
+    ``trim_trailing_whitespace``, ``indent_style`` and ``charset``.
+    Only the first violation of each property is reported.  Anything but
+    a regular file is reported as a violation with ``property`` set to
+    ``None``, without being read.  Raises ``OSError`` if the file cannot
+    be opened.
+
+    """
+
+    # Opening without blocking keeps FIFOs from waiting for a writer
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_NONBLOCK", 0) |
+                 getattr(os, "O_BINARY", 0))
+    with open(fd, "rb") as fp:
+        st = os.fstat(fp.fileno())
+        if not stat.S_ISREG(st.st_mode):
+            return [Violation(path, None, None, None, "not a regular file")]
+        if not any(name in options for name in (
+                "end_of_line", "insert_final_newline",
+                "trim_trailing_whitespace", "indent_style", "charset")):
+            return []
+        if st.st_size == 0:
+            return list(_check_data(path, b"", options))
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return list(_check_data(path, data, options))
+
+
+def _check_batch(batch: list[tuple[str, dict[str, str]]]) -> list[Violation]:
+    violations = []
+    for path, options in batch:
+        try:
+            violations.extend(check_file(path, options))
+        except OSError as e:
+            violations.append(Violation(path, None, None, None, str(e)))
+    return violations
+
+
+def _batches(paths: Iterable[str], resolver: Resolver
+             ) -> Iterator[list[tuple[str, dict[str, str]]]]:
+    batch = []
+    for path in paths:
+        batch.append((path, dict(resolver.resolve(path))))
+        if len(batch) == _BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _executor(workers: int) -> Executor:
+    """Return pool of workers able to scan files in parallel"""
+    # Threads only run Python code in parallel without the GIL
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+    if is_gil_enabled():
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def check_files(paths: Iterable[str], resolver: Optional[Resolver] = None,
+                workers: Optional[int] = None) -> Iterator[Violation]:
+
+    """
+    Resolve properties of each path and yield violations found
+
+    Properties are resolved in the calling thread.  Files are then
+    checked by ``workers`` worker processes (``os.cpu_count()`` by
+    default), or threads on Python builds without the GIL, and in the
+    calling thread if ``workers`` is 1.  Violations are yielded as soon as
+    they are known, in the order of ``paths``.  Exceptions raised by
+    ``resolver`` while resolving properties are propagated.
+
+    """
+
+    if resolver is None:
+        resolver = default_resolver()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    batches = _batches(paths, resolver)
+    if workers == 1:
+        for batch in batches:
+            yield from _check_batch(batch)
+        return
+    with _executor(workers) as executor:
+        pending: deque[Future[list[Violation]]] = deque()
+        for batch in batches:
+            pending.append(executor.submit(_check_batch, batch))
+            # Bound the number of queued files so paths can be a stream
+            if len(pending) >= workers * 4:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
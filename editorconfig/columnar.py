@@ -0,0 +1,175 @@
+"""EditorConfig columnar batch output
+
+Provides ``get_columnar_properties`` for resolving EditorConfig
+properties of many files into one dictionary-encoded column per property,
+suitable for loading into dataframes without a Python object per file.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Optional, TextIO
+
+from editorconfig.loaders import EditorConfigLoader
+from editorconfig.resolver import Resolver, default_resolver
+
+
+__all__ = ['ColumnarProperties', 'get_columnar_properties']
+
+
+# Signed typecodes by increasing width, used for growing columns of codes
+_TYPECODES = [('b', 1 << 7), ('h', 1 << 15), ('i', 1 << 31), ('q', 1 << 63)]
+
+# Codes of the properties set in a row, as ``((name, code), ...)``
+_Row = tuple[tuple[str, int], ...]
+
+
+class _SnapshotLoader(EditorConfigLoader):
+
+    """Loader reading each file of another loader once per batch"""
+
+    def __init__(self, loader: EditorConfigLoader):
+        self.loader = loader
+        self.files: dict[str, Optional[str]] = {}
+
+    def load(self, filenames: Sequence[str]
+             ) -> Iterator[tuple[str, Optional[str]]]:
+        missing = [filename for filename in filenames
+                   if filename not in self.files]
+        loaded = iter(self.loader.load(missing) if missing else ())
+        for filename in filenames:
+            # Files not read yet come from loaded in the same order
+            if filename not in self.files:
+                self.files.update([next(loaded)])
+            yield filename, self.files[filename]
+
+    def is_repository_root(self, directory: str) -> bool:
+        return self.loader.is_repository_root(directory)
+
+
+class ColumnarProperties(object):
+
+    """
+    EditorConfig properties of many files stored column-wise
+
+    ``paths`` lists the files in order.  For each property name in
+    ``names``, ``codes[name]`` is an ``array.array`` of signed integers
+    with one entry per file, indexing into the value table
+    ``values[name]``, or -1 if the property is unset for that file.
+    Codes use the narrowest typecode that fits the value table.
+
+    """
+
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+        self.names: list[str] = []
+        self.codes: dict[str, array[int]] = {}
+        self.values: dict[str, list[str]] = {}
+        self._index: dict[str, dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _add_column(self, name: str) -> None:
+        self.names.append(name)
+        self.codes[name] = array('b', [-1]) * len(self.paths)
+        self.values[name] = []
+        self._index[name] = {}
+
+    def append(self, path: str, options: Iterable[tuple[str, str]]) -> None:
+        """Add properties of file at path as a new row"""
+        self._append_row(path, self._encode(options))
+
+    def _encode(self, options: Iterable[tuple[str, str]]) -> _Row:
+        """Return codes of options, adding new values to the value tables"""
+        row = []
+        for name, value in options:
+            if name not in self.codes:
+                self._add_column(name)
+            index = self._index[name]
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(self.values[name])
+                self.values[name].append(value)
+                self._widen(name, code)
+            row.append((name, code))
+        return tuple(row)
+
+    def _append_row(self, path: str, row: _Row) -> None:
+        position = len(self.paths)
+        self.paths.append(path)
+        for name in self.names:
+            self.codes[name].append(-1)
+        for name, code in row:
+            self.codes[name][position] = code
+
+    def _widen(self, name: str, code: int) -> None:
+        codes = self.codes[name]
+        for typecode, limit in _TYPECODES:
+            if code < limit:
+                if typecode != codes.typecode:
+                    self.codes[name] = array(typecode, codes)
+                return
+
+    def column(self, name: str) -> list[Optional[str]]:
+        """Return decoded values of property name, None where unset"""
+        values = self.values.get(name, [])
+        codes = self.codes.get(name, array('b', [-1]) * len(self.paths))
+        return [values[code] if code >= 0 else None for code in codes]
+
+    def write_csv(self, fp: TextIO) -> None:
+        """Write a CSV table with a path column and a column per property
+
+        Values are written decoded, so the table loads as is into
+        spreadsheets and dataframe readers; ``codes`` and ``values`` are
+        the compact form.  Values are quoted and unset properties are
+        written as unquoted empty fields, which tells them apart from
+        properties set to an empty value.
+        """
+        fp.write(','.join(map(_quote, ['path'] + self.names)) + '\n')
+        tables = [self.values[name] for name in self.names]
+        columns = [self.codes[name] for name in self.names]
+        for row, path in enumerate(self.paths):
+            fp.write(','.join([_quote(path)] + [
+                _quote(table[codes[row]]) if codes[row] >= 0 else ''
+                for table, codes in zip(tables, columns)]) + '\n')
+
+
+def _quote(value: str) -> str:
+    """Return value as a quoted CSV field"""
+    return '"%s"' % value.replace('"', '""')
+
+
+def get_columnar_properties(filepaths: Iterable[str],
+                            resolver: Optional[Resolver] = None
+                            ) -> ColumnarProperties:
+
+    """
+    Resolve EditorConfig properties of filepaths into columns
+
+    Each EditorConfig file is read at most once for the whole batch, so
+    changes made to EditorConfig files while it runs are not seen.
+    Properties are merged once per combination of EditorConfig files and
+    matching sections, and shared by every file with that combination.
+    Raises the same exceptions as ``Resolver.resolve``.
+
+    """
+
+    if resolver is None:
+        resolver = default_resolver()
+    batch_resolver = Resolver(
+        resolver.conf_filename, resolver.version,
+        _SnapshotLoader(resolver.loader), resolver.ceiling_directories,
+        resolver.stop_at_repository_root, resolver.cache)
+    result = ColumnarProperties()
+    rows: dict[tuple[tuple[str, tuple[int, ...]], ...], _Row] = {}
+    for filepath in filepaths:
+        key = batch_resolver.get_matching_sections(filepath)
+        row = rows.get(key)
+        if row is None:
+            options = batch_resolver.resolve(filepath)
+            row = rows[key] = result._encode(options.items())
+        result._append_row(filepath, row)
+    return result
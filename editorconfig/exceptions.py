@@ -22,3 +22,7 @@ class PathError(ValueError, EditorConfigError):
 
 class VersionError(ValueError, EditorConfigError):
     """Error raised if invalid version number is specified"""
+
+
+class LoaderError(OSError, EditorConfigError):
+    """Error raised if a loader cannot access its EditorConfig files"""
@@ -9,9 +9,13 @@ Licensed under Simplified BSD License (see LICENSE.BSD file).
 
 import os
 from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
 
-from editorconfig.exceptions import PathError, VersionError
-from editorconfig.ini import EditorConfigParser
+from editorconfig.exceptions import PathError
+from editorconfig.loaders import EditorConfigLoader
+from editorconfig.resolver import (Resolver, default_resolver, get_filenames,
+                                   preprocess_values)
 from editorconfig.version import VERSION
 from editorconfig.versiontools import VersionTuple
 
@@ -19,37 +23,44 @@ from editorconfig.versiontools import VersionTuple
 __all__ = ['EditorConfigHandler']
 
 
-def get_filenames(path: str, filename: str) -> list[str]:
-    """Yield full filepath for filename in each directory in and above path"""
-    path_list = []
-    while True:
-        path_list.append(os.path.join(path, filename))
-        newpath = os.path.dirname(path)
-        if path == newpath:
-            break
-        path = newpath
-    return path_list
-
-
 class EditorConfigHandler(object):
 
     """
     Allows locating and parsing of EditorConfig files for given filename
 
-    In addition to the constructor a single public method is provided,
+    In addition to the constructor two public methods are provided,
     ``get_configurations`` which returns the EditorConfig options for
-    the ``filepath`` specified to the constructor.
+    the ``filepath`` specified to the constructor and ``get_property``
+    which returns the value of a single option.  EditorConfig files
+    are read through ``loader``, the local filesystem by default.
+
+    Lookups are delegated to a ``Resolver``, shared between handlers
+    reading from the local filesystem or from one of the most recently
+    used loaders.
 
     """
 
     def __init__(self, filepath: str, conf_filename: str = '.editorconfig',
-                 version: VersionTuple = VERSION):
+                 version: VersionTuple = VERSION,
+                 loader: Optional[EditorConfigLoader] = None):
         """Create EditorConfigHandler for matching given filepath"""
         self.filepath: str = filepath
         self.conf_filename: str = conf_filename
         self.version: VersionTuple = version
+        self.loader: Optional[EditorConfigLoader] = loader
         self.options: OrderedDict[str, str] = OrderedDict()
 
+    def get_resolver(self) -> Resolver:
+        """Return Resolver for conf_filename, version and loader"""
+        if self.loader is None:
+            return default_resolver(self.conf_filename, self.version)
+        try:
+            return _loader_resolver(self.loader, self.conf_filename,
+                                    self.version)
+        except TypeError:
+            # Loaders comparing by value may be unhashable
+            return Resolver(self.conf_filename, self.version, self.loader)
+
     def get_configurations(self) -> OrderedDict[str, str]:
 
         """
@@ -63,26 +74,20 @@ class EditorConfigHandler(object):
 
         """
 
-        self.check_assertions()
-        path, filename = os.path.split(self.filepath)
-        conf_files = get_filenames(path, self.conf_filename)
+        self.options = self.get_resolver().resolve(self.filepath)
+        return self.options
 
-        # Attempt to find and parse every EditorConfig file in filetree
-        for filename in conf_files:
-            parser = EditorConfigParser(self.filepath)
-            parser.read(filename)
+    def get_property(self, name: str) -> Optional[str]:
 
-            # Merge new EditorConfig file's options into current options
-            old_options = self.options
-            self.options = parser.options
-            self.options.update(old_options)
+        """
+        Find EditorConfig files and return the value of option name
 
-            # Stop parsing if parsed file has a ``root = true`` option
-            if parser.root_file:
-                break
+        Returns ``None`` if the option is unset.  Raises the same
+        exceptions as ``get_configurations``.
 
-        self.preprocess_values()
-        return self.options
+        """
+
+        return self.get_resolver().get_property(self.filepath, name)
 
     def check_assertions(self) -> None:
 
@@ -92,37 +97,17 @@ class EditorConfigHandler(object):
         if not os.path.isabs(self.filepath):
             raise PathError("Input file must be a full path name.")
 
-        # Raise ``VersionError`` if version specified is greater than current
-        if self.version is not None and self.version[:3] > VERSION[:3]:
-            raise VersionError(
-                "Required version is greater than the current version.")
+        # Creating the resolver raises ``VersionError`` if version is invalid
+        self.get_resolver()
 
     def preprocess_values(self) -> None:
 
         """Preprocess option values for consumption by plugins"""
 
-        opts = self.options
-
-        # Lowercase option value for certain options
-        for name in ["end_of_line", "indent_style", "indent_size",
-                     "insert_final_newline", "trim_trailing_whitespace",
-                     "charset"]:
-            if name in opts:
-                opts[name] = opts[name].lower()
-
-        # Set indent_size to "tab" if indent_size is unspecified and
-        # indent_style is set to "tab".
-        if (opts.get("indent_style") == "tab" and
-                not "indent_size" in opts and self.version >= (0, 10, 0)):
-            opts["indent_size"] = "tab"
-
-        # Set tab_width to indent_size if indent_size is specified and
-        # tab_width is unspecified
-        if ("indent_size" in opts and "tab_width" not in opts and
-                opts["indent_size"] != "tab"):
-            opts["tab_width"] = opts["indent_size"]
-
-        # Set indent_size to tab_width if indent_size is "tab"
-        if ("indent_size" in opts and "tab_width" in opts and
-                opts["indent_size"] == "tab"):
-            opts["indent_size"] = opts["tab_width"]
+        preprocess_values(self.options, self.version)
+
+
+@lru_cache(maxsize=16)
+def _loader_resolver(loader: EditorConfigLoader, conf_filename: str,
+                     version: VersionTuple) -> Resolver:
+    return Resolver(conf_filename, version, loader)
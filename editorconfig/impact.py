@@ -0,0 +1,138 @@
+"""EditorConfig change impact
+
+Provides ``get_changed_paths`` for finding the files whose properties
+differ between two versions of a single EditorConfig file.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from difflib import SequenceMatcher
+from typing import Optional
+
+from editorconfig.exceptions import PathError
+from editorconfig.ini import EditorConfigParser
+from editorconfig.loaders import EditorConfigLoader, FileSystemLoader
+from editorconfig.resolver import Resolver
+from editorconfig.version import VERSION
+from editorconfig.versiontools import VersionTuple
+
+
+__all__ = ['get_changed_paths']
+
+
+class _OverrideLoader(EditorConfigLoader):
+
+    """Loader replacing the contents of one file of another loader"""
+
+    def __init__(self, loader: EditorConfigLoader, filename: str,
+                 contents: Optional[str]):
+        self.loader = loader
+        self.filename = os.path.normpath(filename)
+        self.contents = contents
+
+    def load(self, filenames: Sequence[str]
+             ) -> Iterator[tuple[str, Optional[str]]]:
+        for filename, contents in self.loader.load(filenames):
+            if os.path.normpath(filename) == self.filename:
+                contents = self.contents
+            yield filename, contents
+
+    def is_repository_root(self, directory: str) -> bool:
+        return self.loader.is_repository_root(directory)
+
+
+def _parse(conf_path: str, contents: Optional[str]) -> EditorConfigParser:
+    parser = EditorConfigParser(conf_path)
+    if contents is not None:
+        parser.parse_string(contents, conf_path)
+    return parser
+
+
+def _changed_globs(old: EditorConfigParser,
+                   new: EditorConfigParser) -> list[str]:
+    """Return globs of sections added, removed or modified between files
+
+    Sections kept in the same relative order with the same options are
+    left out, as they contribute identically to every file they match.
+
+    """
+    old_sections = [(glob, tuple(options.items()))
+                    for glob, options in old.sections]
+    new_sections = [(glob, tuple(options.items()))
+                    for glob, options in new.sections]
+    matcher = SequenceMatcher(None, old_sections, new_sections,
+                              autojunk=False)
+    globs = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            for glob, options in old_sections[i1:i2] + new_sections[j1:j2]:
+                if options:
+                    globs.append(glob)
+    return list(OrderedDict.fromkeys(globs))
+
+
+def get_changed_paths(conf_path: str, old_contents: Optional[str],
+                      new_contents: Optional[str], filepaths: Iterable[str],
+                      loader: Optional[EditorConfigLoader] = None,
+                      version: VersionTuple = VERSION,
+                      ceiling_directories: Optional[Iterable[str]] = None,
+                      stop_at_repository_root: bool = False) -> list[str]:
+
+    """
+    Return filepaths whose properties differ between two config versions
+
+    ``conf_path`` is the full path of the EditorConfig file that changed
+    and ``old_contents``/``new_contents`` are its contents before and
+    after the change (``None`` if the file did not exist).  Every other
+    EditorConfig file is read through ``loader``.  The search for
+    EditorConfig files is limited by ``ceiling_directories`` and
+    ``stop_at_repository_root`` as for ``Resolver``.
+
+    Only sections that were added, removed or modified are matched
+    against the filepaths; the remaining filepaths are resolved fully
+    with both versions to confirm that their properties changed.
+
+    """
+
+    if not os.path.isabs(conf_path):
+        raise PathError("Input file must be a full path name.")
+    conf_path = os.path.normpath(conf_path)
+    conf_dir, conf_filename = os.path.split(conf_path)
+    if loader is None:
+        loader = FileSystemLoader()
+    old = _parse(conf_path, old_contents)
+    new = _parse(conf_path, new_contents)
+    globs = _changed_globs(old, new)
+    root_changed = old.root_file != new.root_file
+    if not globs and not root_changed:
+        return []
+
+    if ceiling_directories is not None:
+        ceiling_directories = list(ceiling_directories)
+    old_resolver = Resolver(conf_filename, version,
+                            _OverrideLoader(loader, conf_path, old_contents),
+                            ceiling_directories, stop_at_repository_root)
+    new_resolver = Resolver(conf_filename, version,
+                            _OverrideLoader(loader, conf_path, new_contents),
+                            ceiling_directories, stop_at_repository_root)
+    prefix = os.path.join(conf_dir, '')
+    changed = []
+    for filepath in filepaths:
+        if not os.path.isabs(filepath):
+            raise PathError("Input file must be a full path name.")
+        if not os.path.normpath(filepath).startswith(prefix):
+            continue
+        if not root_changed:
+            parser = EditorConfigParser(filepath)
+            if not any(parser.matches_filename(conf_path, glob)
+                       for glob in globs):
+                continue
+        old_options = old_resolver.resolve(filepath)
+        new_options = new_resolver.resolve(filepath)
+        if dict(old_options) != dict(new_options):
+            changed.append(filepath)
+    return changed
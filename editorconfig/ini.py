@@ -9,6 +9,7 @@ Changes to original ConfigParser:
 - Special characters can be used in section names
 - Octothorpe can be used for comments (not just at beginning of line)
 - Only track INI options in sections that match target filename
+- Keep all sections in order of appearance for filename-independent use
 - Stop parsing files with when ``root = true`` is found
 
 """
@@ -16,7 +17,7 @@ Changes to original ConfigParser:
 import posixpath
 import re
 from collections import OrderedDict
-from io import TextIOBase
+from io import StringIO, TextIOBase
 from os import sep
 from os.path import dirname, normpath
 
@@ -24,7 +25,21 @@ from editorconfig.exceptions import ParsingError
 from editorconfig.fnmatch import fnmatch
 
 
-__all__ = ["ParsingError", "EditorConfigParser"]
+__all__ = ["ParsingError", "EditorConfigParser", "expand_glob"]
+
+
+def expand_glob(config_filename: str, glob: str) -> str:
+    """Return section glob of config_filename as a pattern for full paths"""
+    config_dirname = normpath(dirname(config_filename)).replace(sep, '/')
+    glob = glob.replace("\\#", "#")
+    glob = glob.replace("\\;", ";")
+    if '/' in glob:
+        if glob.find('/') == 0:
+            glob = glob[1:]
+        glob = posixpath.join(config_dirname, glob)
+    else:
+        glob = posixpath.join('**/', glob)
+    return glob
 
 
 class EditorConfigParser(object):
@@ -79,19 +94,11 @@ class EditorConfigParser(object):
         self.filename: str = filename
         self.options: OrderedDict[str, str] = OrderedDict()
         self.root_file: bool = False
+        self.sections: list[tuple[str, OrderedDict[str, str]]] = []
 
     def matches_filename(self, config_filename: str, glob: str) -> bool:
         """Return True if section glob matches filename"""
-        config_dirname = normpath(dirname(config_filename)).replace(sep, '/')
-        glob = glob.replace("\\#", "#")
-        glob = glob.replace("\\;", ";")
-        if '/' in glob:
-            if glob.find('/') == 0:
-                glob = glob[1:]
-            glob = posixpath.join(config_dirname, glob)
-        else:
-            glob = posixpath.join('**/', glob)
-        return fnmatch(self.filename, glob)
+        return fnmatch(self.filename, expand_glob(config_filename, glob))
 
     def read(self, filename: str) -> None:
         """Read and parse single EditorConfig file"""
@@ -101,7 +108,22 @@ class EditorConfigParser(object):
         except OSError:
             return
 
+    def parse_string(self, string: str, filename: str) -> None:
+        """Parse contents of single EditorConfig file without matching
+
+        Only ``sections`` and ``root_file`` are populated.
+        """
+        self._parse(StringIO(string, newline=None), filename)
+
     def _read(self, fp: TextIOBase, fpname: str) -> None:
+        """Parse file and track options of sections matching filename"""
+        start = len(self.sections)
+        self._parse(fp, fpname)
+        for glob, options in self.sections[start:]:
+            if options and self.matches_filename(fpname, glob):
+                self.options.update(options)
+
+    def _parse(self, fp: TextIOBase, fpname: str) -> None:
         """Parse a sectioned setup file.
 
         The sections in setup file contains a title line at the top,
@@ -112,7 +134,7 @@ class EditorConfigParser(object):
         and just about everything else are ignored.
         """
         in_section = False
-        matching_section = False
+        section_options: OrderedDict[str, str] = OrderedDict()
         optname = None
         lineno = 0
         e = None                                  # None, or an exception
@@ -133,7 +155,8 @@ class EditorConfigParser(object):
                 if mo:
                     sectname = mo.group('header')
                     in_section = True
-                    matching_section = self.matches_filename(fpname, sectname)
+                    section_options = OrderedDict()
+                    self.sections.append((sectname, section_options))
                     # So sections can't start with a continuation line
                     optname = None
                 # an option line?
@@ -154,8 +177,8 @@ class EditorConfigParser(object):
                         optname = self.optionxform(optname.rstrip())
                         if not in_section and optname == 'root':
                             self.root_file = (optval.lower() == 'true')
-                        if matching_section:
-                            self.options[optname] = optval
+                        if in_section:
+                            section_options[optname] = optval
                     else:
                         # a non-fatal parsing error occurred.  set up the
                         # exception but keep going. the exception will be
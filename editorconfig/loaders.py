@@ -0,0 +1,219 @@
+"""EditorConfig file loaders
+
+Provides loader classes used by ``EditorConfigHandler`` to fetch the
+contents of EditorConfig files from the filesystem, from an in-memory
+mapping or from a revision of a git repository.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import os
+import subprocess
+import threading
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import IO, Optional
+
+from editorconfig.exceptions import LoaderError
+
+
+__all__ = ['EditorConfigLoader', 'FileSystemLoader', 'MappingLoader',
+           'GitLoader']
+
+
+class EditorConfigLoader(object):
+
+    """
+    Base class for EditorConfig file loaders
+
+    Subclasses implement ``load`` which receives every candidate
+    EditorConfig filepath of a lookup at once, nearest file first, so
+    that loaders with a high per-request cost can fetch them in a single
+    batch.
+
+    """
+
+    def load(self, filenames: Sequence[str]
+             ) -> Iterable[tuple[str, Optional[str]]]:
+        """Yield ``(filename, contents)`` pairs in the order given
+
+        ``contents`` is ``None`` if the file does not exist.  Callers may
+        stop iterating early, e.g. once a ``root = true`` file is found.
+
+        """
+        raise NotImplementedError
+
+    def is_repository_root(self, directory: str) -> bool:
+        """Return True if directory is the root of a repository
+
+        Used to stop the search for EditorConfig files at the repository
+        root.  Checks for a ``.git`` entry on the local filesystem unless
+        overridden.
+
+        """
+        return os.path.lexists(os.path.join(directory, '.git'))
+
+
+class FileSystemLoader(EditorConfigLoader):
+
+    """Load EditorConfig files from the local filesystem"""
+
+    def load(self, filenames: Sequence[str]
+             ) -> Iterator[tuple[str, Optional[str]]]:
+        for filename in filenames:
+            try:
+                with open(filename, encoding='utf-8', mode='r') as fp:
+                    contents: Optional[str] = fp.read()
+            except OSError:
+                contents = None
+            yield filename, contents
+
+
+class MappingLoader(EditorConfigLoader):
+
+    """
+    Load EditorConfig files from a mapping of filepath to contents
+
+    Directories with a ``.git`` entry in the mapping, whatever its
+    contents, are repository roots.
+
+    """
+
+    def __init__(self, files: Mapping[str, str]):
+        self.files: dict[str, str] = {
+            os.path.normpath(filename): contents
+            for filename, contents in files.items()}
+
+    def load(self, filenames: Sequence[str]
+             ) -> Iterator[tuple[str, Optional[str]]]:
+        for filename in filenames:
+            yield filename, self.files.get(os.path.normpath(filename))
+
+    def is_repository_root(self, directory: str) -> bool:
+        return os.path.normpath(os.path.join(directory, '.git')) in self.files
+
+
+class GitLoader(EditorConfigLoader):
+
+    """
+    Load EditorConfig files from a revision of a local git repository
+
+    Filepaths below ``root`` (the repository path by default) are mapped
+    onto the tree of ``revision``, so properties can be resolved without
+    checking the revision out.  ``root`` is the only repository root.
+    Candidate files of a lookup are fetched together through a single
+    long-running ``git cat-file --batch`` process, which is started on
+    first use and stopped by ``close``.
+
+    """
+
+    def __init__(self, repository: str, revision: str = 'HEAD',
+                 root: Optional[str] = None):
+        self.repository: str = repository
+        self.root: str = os.path.abspath(
+            root if root is not None else repository)
+        try:
+            result = subprocess.run(
+                ['git', '-C', repository, 'rev-parse', '--verify', '--quiet',
+                 '--end-of-options', revision + '^{tree}'],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                check=True)
+        except (OSError, subprocess.CalledProcessError):
+            raise LoaderError("Unable to read revision %s of repository %s" %
+                              (revision, repository))
+        self.tree: str = result.stdout.decode('utf-8').strip()
+        self._process: Optional['subprocess.Popen[bytes]'] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> 'GitLoader':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _object_name(self, filename: str) -> Optional[str]:
+        """Return git object name for filename or None if outside root"""
+        relpath = os.path.relpath(os.path.abspath(filename), self.root)
+        if relpath == os.pardir or relpath.startswith(os.pardir + os.sep):
+            return None
+        if '\n' in relpath:
+            return None
+        return '%s:%s' % (self.tree, relpath.replace(os.sep, '/'))
+
+    def is_repository_root(self, directory: str) -> bool:
+        return (os.path.normcase(os.path.abspath(directory)) ==
+                os.path.normcase(self.root))
+
+    def _start(self) -> 'subprocess.Popen[bytes]':
+        if self._process is None or self._process.poll() is not None:
+            try:
+                self._process = subprocess.Popen(
+                    ['git', '-C', self.repository, 'cat-file', '--batch'],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL)
+            except OSError:
+                raise LoaderError("Unable to start git in repository %s" %
+                                  self.repository)
+        return self._process
+
+    def _read_object(self, stdout: IO[bytes]) -> Optional[bytes]:
+        """Read one ``cat-file --batch`` response, None if not a blob"""
+        header = stdout.readline()
+        if not header:
+            raise LoaderError("git cat-file exited unexpectedly")
+        header = header.rstrip(b'\n')
+        # Replies for unknown objects echo the object name, which may
+        # contain spaces: "<object> missing" or "<object> ambiguous"
+        if header.endswith((b' missing', b' ambiguous')):
+            return None
+        oid, objtype, size = header.split(b' ')
+        data = stdout.read(int(size) + 1)[:-1]
+        return data if objtype == b'blob' else None
+
+    def _kill(self) -> None:
+        """Stop a ``git cat-file`` process whose output is out of sync"""
+        process, self._process = self._process, None
+        if process is not None:
+            process.kill()
+            process.wait()
+            for stream in (process.stdin, process.stdout):
+                if stream is not None:
+                    stream.close()
+
+    def load(self, filenames: Sequence[str]
+             ) -> Iterator[tuple[str, Optional[str]]]:
+        names = [self._object_name(filename) for filename in filenames]
+        request = ''.join(name + '\n' for name in names if name is not None)
+        blobs: list[Optional[bytes]] = []
+        if request:
+            with self._lock:
+                process = self._start()
+                assert process.stdin is not None
+                assert process.stdout is not None
+                try:
+                    process.stdin.write(request.encode('utf-8'))
+                    process.stdin.flush()
+                    for name in names:
+                        if name is not None:
+                            blobs.append(self._read_object(process.stdout))
+                except BaseException as e:
+                    # Unread replies would be returned for the next batch
+                    self._kill()
+                    if isinstance(e, (OSError, ValueError)):
+                        raise LoaderError("git cat-file exited unexpectedly")
+                    raise
+        results = iter(blobs)
+        for filename, name in zip(filenames, names):
+            data = next(results) if name is not None else None
+            yield filename, None if data is None else data.decode('utf-8')
+
+    def close(self) -> None:
+        """Stop the background ``git cat-file`` process"""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None:
+            assert process.stdin is not None
+            process.stdin.close()
+            process.wait()
+            if process.stdout is not None:
+                process.stdout.close()
@@ -0,0 +1,423 @@
+"""EditorConfig property resolver
+
+Provides ``Resolver`` class for resolving EditorConfig properties of any
+number of filepaths, reusing parsed EditorConfig files between lookups.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Collection, Iterable, Iterator
+from functools import lru_cache
+from typing import Optional
+
+from editorconfig.exceptions import PathError, VersionError
+from editorconfig.fnmatch import fnmatchcase
+from editorconfig.ini import EditorConfigParser, expand_glob
+from editorconfig.loaders import EditorConfigLoader, FileSystemLoader
+from editorconfig.version import VERSION
+from editorconfig.versiontools import VersionTuple
+
+
+__all__ = ['Resolver', 'ResolverCache', 'default_resolver',
+           'get_ceiling_directories', 'get_filenames', 'preprocess_values']
+
+
+# Section of an EditorConfig file as ``(glob, ((name, value), ...))``
+Section = tuple[str, tuple[tuple[str, str], ...]]
+
+# Filename-independent form of a parsed EditorConfig file: its root flag
+# and its non-empty sections in file order
+ParsedConfig = tuple[bool, tuple[Section, ...]]
+
+
+def get_filenames(path: str, filename: str,
+                  ceiling_directories: Collection[str] = (),
+                  stop_at_repository_root: bool = False,
+                  loader: Optional[EditorConfigLoader] = None) -> list[str]:
+    """Yield full filepath for filename in each directory in and above path
+
+    The search stops at the first directory in ``ceiling_directories``
+    (normalized with ``normalize_directory``) and, if
+    ``stop_at_repository_root`` is set, at the first repository root
+    according to ``loader`` (a directory containing a ``.git`` entry on
+    the local filesystem by default).  Directories above them are never
+    probed.  Finding the repository root on the filesystem costs one
+    ``lstat`` call per directory searched.
+
+    """
+    if loader is None:
+        loader = FileSystemLoader()
+    path_list = [os.path.join(path, filename)]
+    while not _is_search_top(path, ceiling_directories,
+                             stop_at_repository_root, loader):
+        path = os.path.dirname(path)
+        path_list.append(os.path.join(path, filename))
+    return path_list
+
+
+def _is_search_top(path: str, ceiling_directories: Collection[str],
+                   stop_at_repository_root: bool,
+                   loader: EditorConfigLoader) -> bool:
+    """Return True if no directory above path is searched"""
+    if (ceiling_directories and
+            normalize_directory(path) in ceiling_directories):
+        return True
+    if stop_at_repository_root and loader.is_repository_root(path):
+        return True
+    return os.path.dirname(path) == path
+
+
+def normalize_directory(path: str) -> str:
+    """Return normalized form of path for comparing directories"""
+    return os.path.normcase(os.path.normpath(path))
+
+
+def get_ceiling_directories(value: Optional[str] = None) -> frozenset[str]:
+    """Return ceiling directories listed in value or in the environment
+
+    value is a list of absolute directories separated by ``os.pathsep``,
+    read from ``EDITORCONFIG_CEILING_DIRECTORIES`` if not given.  Relative
+    and empty entries are ignored.
+
+    """
+    if value is None:
+        value = os.environ.get('EDITORCONFIG_CEILING_DIRECTORIES', '')
+    return frozenset(normalize_directory(path)
+                     for path in value.split(os.pathsep)
+                     if os.path.isabs(path))
+
+
+def parse_config(contents: str, filename: str) -> ParsedConfig:
+    """Parse contents of EditorConfig file into its ``ParsedConfig`` form"""
+    parser = EditorConfigParser(filename)
+    parser.parse_string(contents, filename)
+    return parser.root_file, tuple((glob, tuple(options.items()))
+                                   for glob, options in parser.sections
+                                   if options)
+
+
+def preprocess_values(options: OrderedDict[str, str],
+                      version: VersionTuple) -> None:
+
+    """Preprocess option values for consumption by plugins"""
+
+    opts = options
+
+    # Lowercase option value for certain options
+    for name in ["end_of_line", "indent_style", "indent_size",
+                 "insert_final_newline", "trim_trailing_whitespace",
+                 "charset"]:
+        if name in opts:
+            opts[name] = opts[name].lower()
+
+    # Set indent_size to "tab" if indent_size is unspecified and
+    # indent_style is set to "tab".
+    if (opts.get("indent_style") == "tab" and
+            not "indent_size" in opts and version >= (0, 10, 0)):
+        opts["indent_size"] = "tab"
+
+    # Set tab_width to indent_size if indent_size is specified and
+    # tab_width is unspecified
+    if ("indent_size" in opts and "tab_width" not in opts and
+            opts["indent_size"] != "tab"):
+        opts["tab_width"] = opts["indent_size"]
+
+    # Set indent_size to tab_width if indent_size is "tab"
+    if ("indent_size" in opts and "tab_width" in opts and
+            opts["indent_size"] == "tab"):
+        opts["indent_size"] = opts["tab_width"]
+
+
+class ResolverCache(object):
+
+    """
+    Storage for parsed EditorConfig files that outlives a resolver
+
+    Parsed files are keyed by their contents, so they stay valid for any
+    filename.  Chains are the EditorConfig files found when searching
+    upwards from a directory, ending with the last file searched; a cache
+    storing them lets resolvers skip probing directories without an
+    EditorConfig file.  Resolvers search above a chain whose last file is
+    no longer a root file, but files added to a directory are only found
+    once the cache is invalidated.  This base class stores nothing.
+
+    """
+
+    def get_config(self, contents: str) -> Optional[ParsedConfig]:
+        """Return parsed form of EditorConfig file contents if cached"""
+        return None
+
+    def set_config(self, contents: str, config: ParsedConfig) -> None:
+        """Store parsed form of EditorConfig file contents"""
+
+    def get_chain(self, key: str) -> Optional[tuple[str, ...]]:
+        """Return EditorConfig filepaths of chain key if cached"""
+        return None
+
+    def set_chain(self, key: str, filenames: tuple[str, ...]) -> None:
+        """Store EditorConfig filepaths of chain key"""
+
+
+class Resolver(object):
+
+    """
+    Resolves EditorConfig properties for any number of filepaths
+
+    A resolver validates its settings once and keeps parsed EditorConfig
+    files between lookups.  Files are still read through ``loader`` on
+    every lookup and are only parsed again when their contents changed,
+    so results are always up to date.  At most ``max_cached_files``
+    parsed files are kept, the least recently used being dropped first;
+    ``clear_cache`` drops them all.  Resolvers are safe to share between
+    threads as long as their loader is.
+
+    The upward search for EditorConfig files stops at the nearest of
+    ``ceiling_directories`` (``EDITORCONFIG_CEILING_DIRECTORIES`` by
+    default) and, with ``stop_at_repository_root``, at the nearest
+    repository root according to ``loader``.  These directories are still
+    searched.
+
+    A ``cache`` may be given to share parsed EditorConfig files, and the
+    EditorConfig files found above each directory, between resolvers.
+
+    """
+
+    def __init__(self, conf_filename: str = '.editorconfig',
+                 version: VersionTuple = VERSION,
+                 loader: Optional[EditorConfigLoader] = None,
+                 ceiling_directories: Optional[Iterable[str]] = None,
+                 stop_at_repository_root: bool = False,
+                 cache: Optional[ResolverCache] = None,
+                 max_cached_files: int = 1024):
+        """Create Resolver, raise ``VersionError`` if version is invalid"""
+        if version is not None and version[:3] > VERSION[:3]:
+            raise VersionError(
+                "Required version is greater than the current version.")
+        self.conf_filename: str = conf_filename
+        self.version: VersionTuple = version
+        self.loader: EditorConfigLoader = (
+            loader if loader is not None else FileSystemLoader())
+        self.ceiling_directories: frozenset[str]
+        if ceiling_directories is None:
+            self.ceiling_directories = get_ceiling_directories()
+        else:
+            self.ceiling_directories = frozenset(
+                normalize_directory(path) for path in ceiling_directories)
+        self.stop_at_repository_root: bool = stop_at_repository_root
+        self.cache: ResolverCache = (
+            cache if cache is not None else ResolverCache())
+        # Chains depend on every setting controlling the upward search
+        self._chain_prefix: str = '\0'.join(
+            [conf_filename, str(stop_at_repository_root)] +
+            sorted(self.ceiling_directories)) + '\0\0'
+        self.max_cached_files: int = max_cached_files
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[
+            str, tuple[str, bool, tuple[Section, ...]]] = OrderedDict()
+
+    def _get_config(self, filename: str, contents: str
+                    ) -> tuple[bool, tuple[Section, ...]]:
+        """Return root flag and expanded sections of EditorConfig file"""
+        with self._lock:
+            cached = self._cache.get(filename)
+            if cached is not None:
+                self._cache.move_to_end(filename)
+        if cached is not None and cached[0] == contents:
+            return cached[1], cached[2]
+        parsed = self.cache.get_config(contents)
+        if parsed is None:
+            parsed = parse_config(contents, filename)
+            self.cache.set_config(contents, parsed)
+        root, sections = parsed
+        expanded = tuple((expand_glob(filename, glob), options)
+                         for glob, options in sections)
+        with self._lock:
+            self._cache[filename] = (contents, root, expanded)
+            self._cache.move_to_end(filename)
+            while len(self._cache) > self.max_cached_files:
+                self._cache.popitem(last=False)
+        return root, expanded
+
+    def _iter_configs(self, filepath: str
+                      ) -> Iterator[tuple[str, tuple[Section, ...]]]:
+        """Yield EditorConfig filepaths above filepath and their sections"""
+        if not os.path.isabs(filepath):
+            raise PathError("Input file must be a full path name.")
+        path = os.path.dirname(filepath)
+        key = self._chain_prefix + path
+        chain = self.cache.get_chain(key)
+        if chain is not None:
+            conf_files = list(chain)
+        else:
+            conf_files = get_filenames(path, self.conf_filename,
+                                       self.ceiling_directories,
+                                       self.stop_at_repository_root,
+                                       self.loader)
+        found = []
+        while True:
+            root = False
+            for filename, contents in self.loader.load(conf_files):
+                if contents is None:
+                    continue
+                found.append(filename)
+                root, sections = self._get_config(filename, contents)
+                yield filename, sections
+                if root:
+                    break
+            if root:
+                break
+            # A cached chain may end with a file that is no longer a root
+            # file, so carry on above it unless the search ended there
+            top = os.path.dirname(conf_files[-1])
+            if chain is None or _is_search_top(
+                    top, self.ceiling_directories,
+                    self.stop_at_repository_root, self.loader):
+                if found[-1:] != conf_files[-1:]:
+                    found.append(conf_files[-1])
+                break
+            chain = None
+            conf_files = get_filenames(os.path.dirname(top),
+                                       self.conf_filename,
+                                       self.ceiling_directories,
+                                       self.stop_at_repository_root,
+                                       self.loader)
+        if chain is None:
+            self.cache.set_chain(key, tuple(found))
+
+    def resolve(self, filepath: str) -> OrderedDict[str, str]:
+
+        """
+        Find EditorConfig files and return all options matching filepath
+
+        Special exceptions that may be raised by this function include:
+
+        - ``PathError``: filepath is not a valid absolute filepath
+        - ``ParsingError``: improperly formatted EditorConfig file found
+
+        """
+
+        name = os.path.normpath(filepath).replace(os.sep, '/')
+        options: OrderedDict[str, str] = OrderedDict()
+
+        # Attempt to find and parse every EditorConfig file in filetree
+        for filename, sections in self._iter_configs(filepath):
+
+            # Merge new EditorConfig file's options into current options
+            conf_options: OrderedDict[str, str] = OrderedDict()
+            for pattern, section_options in sections:
+                if fnmatchcase(name, pattern):
+                    conf_options.update(section_options)
+            conf_options.update(options)
+            options = conf_options
+
+        preprocess_values(options, self.version)
+        return options
+
+    def get_matching_sections(self, filepath: str
+                              ) -> tuple[tuple[str, tuple[int, ...]], ...]:
+
+        """
+        Return EditorConfig files applying to filepath and matching sections
+
+        Returns a ``(filename, indices)`` pair for each EditorConfig file
+        found, nearest first, where indices are the positions of the
+        sections matching filepath among the file's non-empty sections.
+        Filepaths with equal results have the same properties, so callers
+        resolving many files need to ``resolve`` only one of them, as
+        long as the EditorConfig files do not change in between.  Raises
+        the same exceptions as ``resolve``.
+
+        """
+
+        name = os.path.normpath(filepath).replace(os.sep, '/')
+        return tuple(
+            (filename, tuple(index for index, (pattern, options)
+                             in enumerate(sections)
+                             if fnmatchcase(name, pattern)))
+            for filename, sections in self._iter_configs(filepath))
+
+    def get_property(self, filepath: str, name: str) -> Optional[str]:
+
+        """
+        Find EditorConfig files and return the value of option name
+
+        EditorConfig files are read nearest first and their sections
+        from last to first, stopping as soon as the value is known.  Only
+        sections setting the option, or an option it is derived from, are
+        matched against filepath.  Returns ``None`` if the option is unset.
+        Raises the same exceptions as ``resolve``.
+
+        """
+
+        target = os.path.normpath(filepath).replace(os.sep, '/')
+        name = name.lower()
+        if name == "indent_size":
+            names = {"indent_size", "indent_style", "tab_width"}
+        elif name == "tab_width":
+            names = {"tab_width", "indent_size"}
+        else:
+            names = {name}
+
+        found: dict[str, str] = {}
+        for filename, sections in self._iter_configs(filepath):
+
+            # Later sections override earlier ones, so the last matching
+            # section setting an option wins
+            for pattern, section_options in reversed(sections):
+                missing = [(key, value) for key, value in section_options
+                           if key in names and key not in found]
+                if missing and fnmatchcase(target, pattern):
+                    for key, value in missing:
+                        found[key] = value
+                    if _is_determined(name, names, found):
+                        break
+
+            if _is_determined(name, names, found):
+                break
+
+        options = OrderedDict(found)
+        preprocess_values(options, self.version)
+        return options.get(name)
+
+    def invalidate(self, filename: str) -> None:
+        """Drop cached EditorConfig file at filename"""
+        with self._lock:
+            self._cache.pop(filename, None)
+
+    def clear_cache(self) -> None:
+        """Drop all cached EditorConfig files"""
+        with self._lock:
+            self._cache.clear()
+
+
+def _is_determined(name: str, names: set[str], found: dict[str, str]) -> bool:
+    """Return True if no other option can change the value of name"""
+    if name in found:
+        # indent_size = tab is replaced by tab_width
+        if name == "indent_size" and found[name].lower() == "tab":
+            return "tab_width" in found
+        return True
+    return names.issubset(found)
+
+
+def default_resolver(conf_filename: str = '.editorconfig',
+                     version: VersionTuple = VERSION) -> Resolver:
+    """Return shared Resolver reading EditorConfig files from filesystem
+
+    ``EDITORCONFIG_CEILING_DIRECTORIES`` is read on every call, so a
+    change to it selects another resolver.
+
+    """
+    return _default_resolver(conf_filename, version,
+                             get_ceiling_directories())
+
+
+@lru_cache(maxsize=16)
+def _default_resolver(conf_filename: str, version: VersionTuple,
+                      ceiling_directories: frozenset[str]) -> Resolver:
+    return Resolver(conf_filename, version,
+                    ceiling_directories=ceiling_directories)
@@ -0,0 +1,243 @@
+"""EditorConfig shared memory cache
+
+Provides ``SharedMemoryCache``, a ``ResolverCache`` kept in a
+``multiprocessing.shared_memory`` segment so that pre-forked worker
+processes share parsed EditorConfig files instead of each parsing and
+storing their own copy.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import hashlib
+import marshal
+import os
+import struct
+import sys
+import zlib
+from multiprocessing import Lock, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Lock as LockType
+from typing import Any, Optional, Union
+
+from editorconfig.resolver import ParsedConfig, ResolverCache
+
+
+__all__ = ['SharedMemoryCache']
+
+
+# Segment layout, all integers little-endian:
+#
+# - header: magic, layout version, marshal version, generation, slot
+#   count, used slots, end of the data area and interpreter cache tag
+# - hash table of ``slot count`` slots: SHA-1 digest of the key, offset and
+#   length of the entry (offset 0 marks an empty slot)
+# - data area: entries appended in insertion order, each a CRC-32 of the
+#   key digest and value followed by the marshal-serialized value
+#
+# The generation is odd while the cache is being invalidated.  Readers do
+# not lock; they discard a value if the generation changed while reading,
+# and the checksum catches entries read while a writer was storing them,
+# as nothing orders the writes seen by readers on other CPUs.
+
+_MAGIC = b'ECSC'
+_LAYOUT_VERSION = 2
+_HEADER = struct.Struct('<4sHHQIIQ16s')
+_GENERATION = struct.Struct('<Q')
+_GENERATION_OFFSET = 8
+_SLOT = struct.Struct('<20sII')
+_SLOT_OFFSET = struct.Struct('<I')
+_CHECKSUM = struct.Struct('<I')
+_MAX_LOAD = 0.75
+
+# Names of segments created by this process, or the process it was forked
+# from, whose resource tracker registration must be kept
+_created: set[str] = set()
+
+# Marshal data is only readable by the interpreter version that wrote it
+_INTERPRETER = (sys.implementation.cache_tag or
+                sys.implementation.name).encode('ascii')[:16]
+
+
+class SharedMemoryCache(ResolverCache):
+
+    """
+    Resolver cache stored in a shared memory segment
+
+    Create the cache in the parent process before forking workers; every
+    worker then shares its segment and lock.  A process that is not a
+    fork of the creator can attach to the segment by ``name`` with
+    ``create=False`` if it runs the same Python version; without the
+    creator's ``lock`` it only reads.  Entries that fail their checksum,
+    e.g. when read while being written, are treated as missing.
+
+    Parsed EditorConfig files are keyed by their contents and never go
+    stale.  Chains of EditorConfig files are kept until ``invalidate`` is
+    called, which should happen whenever EditorConfig files are added or
+    removed; chains ending with a file that is no longer a root file are
+    searched further without it.  Once the segment is full, new entries
+    are not stored.
+
+    Only filename-independent parsed files and chains are shared.  Each
+    resolver still keeps its own copy of up to ``max_cached_files``
+    files with globs expanded for their location, which can be set to 0.
+
+    """
+
+    def __init__(self, name: Optional[str] = None, size: int = 1 << 24,
+                 slots: int = 1 << 16, create: bool = True,
+                 lock: Optional[LockType] = None):
+        """Create or attach to shared memory segment name"""
+        if create:
+            if slots < 1 or slots & (slots - 1):
+                raise ValueError("slots must be a power of two")
+            if size <= _HEADER.size + slots * _SLOT.size:
+                raise ValueError("size is too small for %d slots" % slots)
+            self.shm = SharedMemory(name, create=True, size=size)
+            _created.add(self.shm.name)
+            self.slots: int = slots
+            self.lock: Optional[LockType] = (
+                lock if lock is not None else Lock())
+            _HEADER.pack_into(self._buf, 0, _MAGIC, _LAYOUT_VERSION,
+                              marshal.version, 0, slots, 0, self._data_start,
+                              _INTERPRETER)
+        else:
+            if name is None:
+                raise ValueError("name is required to attach to a cache")
+            self.shm = _attach(name)
+            header = _HEADER.unpack_from(self._buf, 0)
+            if (header[:3] != (_MAGIC, _LAYOUT_VERSION, marshal.version) or
+                    header[7].rstrip(b'\0') != _INTERPRETER):
+                self.shm.close()
+                raise ValueError("%s is not a compatible EditorConfig cache" %
+                                 name)
+            self.slots = header[4]
+            self.lock = lock
+        self.name: str = self.shm.name
+
+    @property
+    def _buf(self) -> memoryview:
+        buf = self.shm.buf
+        assert buf is not None
+        return buf
+
+    @property
+    def _data_start(self) -> int:
+        return _HEADER.size + self.slots * _SLOT.size
+
+    def _generation(self) -> int:
+        generation: int = _GENERATION.unpack_from(
+            self._buf, _GENERATION_OFFSET)[0]
+        return generation
+
+    def _find(self, digest: bytes) -> tuple[int, int, int]:
+        """Return position, value offset and length of slot for digest
+
+        The value offset is 0 if digest is not stored and the position
+        -1 if the table is full.
+        """
+        buf = self._buf
+        mask = self.slots - 1
+        index = int.from_bytes(digest[:4], 'little') & mask
+        for _ in range(self.slots):
+            position = _HEADER.size + index * _SLOT.size
+            slot_digest, offset, length = _SLOT.unpack_from(buf, position)
+            if offset == 0 or slot_digest == digest:
+                return position, offset, length
+            index = (index + 1) & mask
+        return -1, 0, 0
+
+    def _get(self, key: bytes) -> Any:
+        digest = hashlib.sha1(key).digest()
+        generation = self._generation()
+        if generation % 2:
+            return None
+        position, offset, length = self._find(digest)
+        if not offset or length < _CHECKSUM.size:
+            return None
+        entry = bytes(self._buf[offset:offset + length])
+        if self._generation() != generation:
+            return None
+        data = entry[_CHECKSUM.size:]
+        if _CHECKSUM.unpack_from(entry)[0] != zlib.crc32(digest + data):
+            return None
+        try:
+            return marshal.loads(data)
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def _set(self, key: bytes,
+             value: Union[ParsedConfig, tuple[str, ...]]) -> None:
+        if self.lock is None:
+            return
+        digest = hashlib.sha1(key).digest()
+        value_data = marshal.dumps(value)
+        data = _CHECKSUM.pack(zlib.crc32(digest + value_data)) + value_data
+        with self.lock:
+            buf = self._buf
+            header = list(_HEADER.unpack_from(buf, 0))
+            used, end = header[5], header[6]
+            if (used + 1 > self.slots * _MAX_LOAD or
+                    end + len(data) > self.shm.size):
+                return
+            position, offset, length = self._find(digest)
+            if offset or position < 0:
+                return
+            buf[end:end + len(data)] = data
+            # Publish the slot by writing its offset last
+            _SLOT.pack_into(buf, position, digest, 0, len(data))
+            _SLOT_OFFSET.pack_into(buf, position + 20, end)
+            header[5], header[6] = used + 1, end + len(data)
+            _HEADER.pack_into(buf, 0, *header)
+
+    def get_config(self, contents: str) -> Optional[ParsedConfig]:
+        config: Optional[ParsedConfig] = self._get(
+            b'config\0' + contents.encode('utf-8', 'surrogatepass'))
+        return config
+
+    def set_config(self, contents: str, config: ParsedConfig) -> None:
+        self._set(b'config\0' + contents.encode('utf-8', 'surrogatepass'),
+                  config)
+
+    def get_chain(self, key: str) -> Optional[tuple[str, ...]]:
+        chain: Optional[tuple[str, ...]] = self._get(
+            b'chain\0' + key.encode('utf-8', 'surrogatepass'))
+        return chain
+
+    def set_chain(self, key: str, filenames: tuple[str, ...]) -> None:
+        self._set(b'chain\0' + key.encode('utf-8', 'surrogatepass'),
+                  filenames)
+
+    def invalidate(self) -> None:
+        """Drop all entries and start a new generation"""
+        if self.lock is None:
+            raise ValueError("cache was attached without its lock")
+        with self.lock:
+            buf = self._buf
+            generation = self._generation()
+            _GENERATION.pack_into(buf, _GENERATION_OFFSET, generation + 1)
+            buf[_HEADER.size:self._data_start] = bytes(
+                self._data_start - _HEADER.size)
+            _HEADER.pack_into(buf, 0, _MAGIC, _LAYOUT_VERSION,
+                              marshal.version, generation + 2, self.slots, 0,
+                              self._data_start, _INTERPRETER)
+
+    def close(self) -> None:
+        """Detach from the shared memory segment"""
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the shared memory segment, once no process needs it"""
+        self.shm.unlink()
+
+
+def _attach(name: str) -> SharedMemory:
+    # Before Python 3.13 attaching registers the segment with the resource
+    # tracker, which would destroy it when this process exits
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    shm = SharedMemory(name)
+    if os.name == 'posix' and shm.name not in _created:
+        resource_tracker.unregister(shm._name,  # type: ignore[attr-defined]
+                                    'shared_memory')
+    return shm
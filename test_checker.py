@@ -0,0 +1,93 @@
+"""Unit tests for the EditorConfig conformance checker
+
+Run with ``python -m unittest`` from the root of the project tree.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from editorconfig.checker import _check_data, check_file, check_files
+from editorconfig.loaders import MappingLoader
+from editorconfig.resolver import Resolver
+
+
+def lines(data, options):
+    return {violation.property: violation.line
+            for violation in _check_data('file', data, options)}
+
+
+class CheckerTest(unittest.TestCase):
+
+    def test_trailing_whitespace(self):
+        options = {'trim_trailing_whitespace': 'true'}
+        self.assertEqual(lines(b'a\nb  \t\nc\n', options),
+                         {'trim_trailing_whitespace': 2})
+        self.assertEqual(lines(b'a\nb ', options),
+                         {'trim_trailing_whitespace': 2})
+        self.assertEqual(lines(b'a b\n\n', options), {})
+
+    def test_indent_after_cr(self):
+        options = {'indent_style': 'tab', 'end_of_line': 'cr'}
+        self.assertEqual(lines(b'a\r  b\r', options), {'indent_style': 2})
+        options = {'indent_style': 'space', 'end_of_line': 'cr'}
+        self.assertEqual(lines(b'a\r\tb\r', options), {'indent_style': 2})
+
+    def test_indent_first_line(self):
+        self.assertEqual(lines(b'  a\n', {'indent_style': 'tab'}),
+                         {'indent_style': 1})
+        self.assertEqual(lines(b'/*\n * a\n */\n', {'indent_style': 'tab'}),
+                         {})
+
+
+class CheckFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tree)
+        self.resolver = Resolver(loader=MappingLoader({
+            os.path.join(self.tree, '.editorconfig'):
+                "root = true\n[*.txt]\nindent_style = tab\n",
+        }))
+
+    def path(self, name, contents=None):
+        path = os.path.join(self.tree, name)
+        if contents is not None:
+            with open(path, 'wb') as fp:
+                fp.write(contents)
+        return path
+
+    def test_violations_in_order(self):
+        paths = [self.path('%02d.txt' % i, b'\tok\n' if i % 3 else b'  no\n')
+                 for i in range(100)]
+        for workers in (1, 2):
+            violations = list(check_files(paths, self.resolver, workers))
+            self.assertEqual([violation.path for violation in violations],
+                             paths[::3])
+            self.assertEqual({violation.line for violation in violations},
+                             {1})
+
+    def test_not_regular_files(self):
+        missing = self.path('missing.md')
+        directory = self.path('directory')
+        os.mkdir(directory)
+        paths = [missing, directory]
+        if hasattr(os, 'mkfifo'):
+            paths.append(self.path('fifo.txt'))
+            os.mkfifo(paths[-1])
+        for workers in (1, 2):
+            violations = list(check_files(paths, self.resolver, workers))
+            self.assertEqual([violation.path for violation in violations],
+                             paths)
+            self.assertEqual({violation.property for violation in violations},
+                             {None})
+        with self.assertRaises(OSError):
+            check_file(missing, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
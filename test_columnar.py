@@ -0,0 +1,115 @@
+"""Unit tests for EditorConfig columnar batch output
+
+Run with ``python -m unittest`` from the root of the project tree.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import csv
+import io
+import unittest
+
+from editorconfig.columnar import ColumnarProperties, get_columnar_properties
+from editorconfig.loaders import MappingLoader
+from editorconfig.resolver import Resolver
+
+
+class CountingLoader(MappingLoader):
+
+    """MappingLoader counting how often each file is read"""
+
+    def __init__(self, files):
+        super().__init__(files)
+        self.reads = {}
+
+    def load(self, filenames):
+        for filename, contents in super().load(filenames):
+            self.reads[filename] = self.reads.get(filename, 0) + 1
+            yield filename, contents
+
+
+class ColumnarPropertiesTest(unittest.TestCase):
+
+    def test_encoding(self):
+        result = ColumnarProperties()
+        result.append('/a', [('indent_size', '2'), ('charset', 'utf-8')])
+        result.append('/b', [])
+        result.append('/c', [('indent_size', '4'), ('indent_style', '')])
+        result.append('/d', [('indent_size', '2')])
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result.names,
+                         ['indent_size', 'charset', 'indent_style'])
+        self.assertEqual(list(result.codes['indent_size']), [0, -1, 1, 0])
+        self.assertEqual(result.values['indent_size'], ['2', '4'])
+        self.assertEqual(result.column('charset'),
+                         ['utf-8', None, None, None])
+        self.assertEqual(result.column('indent_style'),
+                         [None, None, '', None])
+        self.assertEqual(result.column('unknown'), [None] * 4)
+
+    def test_codes_widen(self):
+        result = ColumnarProperties()
+        for i in range(300):
+            result.append('/%d' % i, [('tab_width', str(i))])
+        codes = result.codes['tab_width']
+        self.assertEqual(codes.typecode, 'h')
+        self.assertEqual(list(codes), list(range(300)))
+
+    def test_csv(self):
+        result = ColumnarProperties()
+        result.append('/a,"b"', [('x', ''), ('y', '1 "2", 3')])
+        result.append('/c', [('y', '4')])
+        fp = io.StringIO()
+        result.write_csv(fp)
+        self.assertEqual(fp.getvalue(),
+                         '"path","x","y"\n'
+                         '"/a,""b""","","1 ""2"", 3"\n'
+                         '"/c",,"4"\n')
+        self.assertEqual(list(csv.reader(io.StringIO(fp.getvalue()))),
+                         [['path', 'x', 'y'], ['/a,"b"', '', '1 "2", 3'],
+                          ['/c', '', '4']])
+
+
+class GetColumnarPropertiesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = CountingLoader({
+            '/r/.editorconfig': "root = true\n[*]\nend_of_line = lf\n"
+                                "[*.py]\nindent_size = 4\n"
+                                "[*.{c,h}]\nindent_style = TAB\n",
+            '/r/sub/.editorconfig': "[*.py]\nindent_size = 2\n"
+                                    "[lib/**]\ncharset = utf-8\n",
+        })
+        self.paths = ['/r/%s%s.%s' % (directory, name, ext)
+                      for directory in ('', 'sub/', 'sub/lib/', 'sub/x/')
+                      for name in ('a', 'b')
+                      for ext in ('py', 'c', 'txt')]
+
+    def test_matches_resolve(self):
+        resolver = Resolver(loader=self.loader, ceiling_directories=[])
+        result = get_columnar_properties(self.paths, resolver)
+        self.assertEqual(result.paths, self.paths)
+        columns = {name: result.column(name) for name in result.names}
+        for row, path in enumerate(self.paths):
+            self.assertEqual(
+                {name: column[row] for name, column in columns.items()
+                 if column[row] is not None},
+                dict(resolver.resolve(path)), path)
+
+    def test_files_read_once(self):
+        resolver = Resolver(loader=self.loader, ceiling_directories=[])
+        get_columnar_properties(self.paths, resolver)
+        self.assertEqual(set(self.loader.reads.values()), {1})
+
+    def test_matching_sections(self):
+        resolver = Resolver(loader=self.loader, ceiling_directories=[])
+        self.assertEqual(
+            resolver.get_matching_sections('/r/sub/lib/a.py'),
+            (('/r/sub/.editorconfig', (0, 1)), ('/r/.editorconfig', (0, 1))))
+        self.assertEqual(resolver.get_matching_sections('/r/a.h'),
+                         (('/r/.editorconfig', (0, 2)),))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Unit tests for EditorConfig change impact
+
+Run with ``python -m unittest`` from the root of the project tree.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import unittest
+
+from editorconfig.exceptions import PathError
+from editorconfig.impact import get_changed_paths
+from editorconfig.loaders import MappingLoader
+
+
+FILES = ['/r/a.py', '/r/a.txt', '/r/sub/b.py', '/r/sub/b.md', '/other/c.py']
+
+
+class ChangedPathsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = MappingLoader({
+            '/.editorconfig': "[*]\nend_of_line = lf\n",
+            '/r/sub/.editorconfig': "[*.md]\nindent_size = 2\n",
+        })
+
+    def changed(self, old, new, **kwargs):
+        return get_changed_paths('/r/.editorconfig', old, new, FILES,
+                                 self.loader, **kwargs)
+
+    def test_modified_section(self):
+        old = "[*.py]\nindent_size = 4\n[*.txt]\nindent_size = 8\n"
+        new = "[*.py]\nindent_size = 2\n[*.txt]\nindent_size = 8\n"
+        self.assertEqual(self.changed(old, new),
+                         ['/r/a.py', '/r/sub/b.py'])
+
+    def test_unchanged_sections(self):
+        old = "[*.py]\nindent_size = 4\n"
+        self.assertEqual(self.changed(old, old), [])
+        # Empty sections and comments do not affect any file
+        self.assertEqual(self.changed(old, "# c\n[*.py]\nindent_size = 4\n"
+                                           "[*.txt]\n"), [])
+
+    def test_overridden_change(self):
+        # The nearer file sets indent_size for Markdown files already
+        self.assertEqual(self.changed("", "[*.md]\nindent_size = 4\n"), [])
+
+    def test_root_changed(self):
+        old = "[*.py]\nindent_size = 4\n"
+        new = "root = true\n[*.py]\nindent_size = 4\n"
+        self.assertEqual(self.changed(old, new), FILES[:4])
+
+    def test_added_and_deleted(self):
+        contents = "[*.txt]\ncharset = utf-8\n"
+        self.assertEqual(self.changed(None, contents), ['/r/a.txt'])
+        self.assertEqual(self.changed(contents, None), ['/r/a.txt'])
+
+    def test_ceiling_directories(self):
+        old = "[*]\nindent_size = 4\n"
+        new = "root = true\n[*]\nindent_size = 4\n"
+        # The root flag only matters to files whose search reaches both
+        # the changed file and /.editorconfig
+        self.assertEqual(self.changed(old, new, ceiling_directories=['/r']),
+                         [])
+        self.assertEqual(
+            self.changed(old, new, ceiling_directories=['/r/sub']),
+            ['/r/a.py', '/r/a.txt'])
+
+    def test_relative_path(self):
+        with self.assertRaises(PathError):
+            get_changed_paths('.editorconfig', "", "", FILES, self.loader)
+        with self.assertRaises(PathError):
+            get_changed_paths('/r/.editorconfig', "", "[*]\nx = 1\n",
+                              ['a.py'], self.loader)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Unit tests for EditorConfig loaders
+
+Run with ``python -m unittest`` from the root of the project tree.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+from editorconfig import get_properties
+from editorconfig.handler import EditorConfigHandler
+from editorconfig.loaders import GitLoader, MappingLoader
+
+
+def git(repository, *args):
+    subprocess.run(['git', '-C', repository] + list(args), check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+@unittest.skipIf(shutil.which('git') is None, "git is not installed")
+class GitLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.repository = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.repository)
+        git(self.repository, 'init', '-q')
+        self.write('.editorconfig', "root = true\n[*.py]\nindent_size = 4\n")
+        self.write('my dir/.editorconfig', "[*]\nindent_style = space\n")
+        os.makedirs(os.path.join(self.repository, 'my dir', 'sub dir'))
+        git(self.repository, 'add', '-A')
+        git(self.repository, '-c', 'user.name=test',
+            '-c', 'user.email=test@example.com', 'commit', '-q', '-m', 'init')
+        self.loader = GitLoader(self.repository)
+        self.addCleanup(self.loader.close)
+
+    def write(self, filename, contents):
+        path = os.path.join(self.repository, filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(contents)
+
+    def test_path_with_spaces(self):
+        filepath = os.path.join(self.repository, 'my dir', 'sub dir', 'a.py')
+        expected = {'indent_style': 'space', 'indent_size': '4',
+                    'tab_width': '4'}
+        self.assertEqual(dict(get_properties(filepath, self.loader)),
+                         expected)
+        # Replies of the previous batch must not leak into the next one
+        filepath = os.path.join(self.repository, 'a.py')
+        self.assertEqual(dict(get_properties(filepath, self.loader)),
+                         {'indent_size': '4', 'tab_width': '4'})
+
+    def test_missing_files(self):
+        filepath = os.path.join(self.repository, 'other dir', 'a.txt')
+        self.assertEqual(dict(get_properties(filepath, self.loader)), {})
+
+    def test_repository_root(self):
+        self.assertTrue(self.loader.is_repository_root(self.repository))
+        self.assertFalse(self.loader.is_repository_root(
+            os.path.join(self.repository, 'my dir')))
+
+
+class MappingLoaderTest(unittest.TestCase):
+
+    def test_properties(self):
+        loader = MappingLoader({
+            '/a/.editorconfig': "root = true\n[*]\nindent_style = tab\n",
+            '/a/b/.editorconfig': "[*.py]\nindent_style = space\n",
+        })
+        self.assertEqual(dict(get_properties('/a/b/c.py', loader)),
+                         {'indent_style': 'space'})
+        self.assertEqual(dict(get_properties('/a/b/c.txt', loader)),
+                         {'indent_style': 'tab', 'indent_size': 'tab'})
+        self.assertEqual(dict(get_properties('/other/c.py', loader)), {})
+
+    def test_resolver_reused_per_loader(self):
+        loader = MappingLoader({})
+        resolver = EditorConfigHandler('/a/b.py', loader=loader).get_resolver()
+        self.assertIs(
+            EditorConfigHandler('/a/c.py', loader=loader).get_resolver(),
+            resolver)
+        self.assertIsNot(EditorConfigHandler(
+            '/a/c.py', loader=MappingLoader({})).get_resolver(), resolver)
+
+if __name__ == '__main__':
+    unittest.main()
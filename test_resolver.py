@@ -0,0 +1,244 @@
+"""Unit tests for the EditorConfig property resolver
+
+Run with ``python -m unittest`` from the root of the project tree.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import itertools
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+from editorconfig import get_property
+from editorconfig.exceptions import PathError, VersionError
+from editorconfig.handler import EditorConfigHandler
+from editorconfig.loaders import MappingLoader
+from editorconfig.resolver import (Resolver, default_resolver,
+                                   get_ceiling_directories, parse_config)
+
+
+class RecordingLoader(MappingLoader):
+
+    """MappingLoader recording the files actually read"""
+
+    def __init__(self, files):
+        super().__init__(files)
+        self.read = []
+
+    def load(self, filenames):
+        for filename, contents in super().load(filenames):
+            self.read.append(filename)
+            yield filename, contents
+
+
+INDENT_OPTIONS = ["indent_style = tab", "indent_style = space",
+                  "indent_size = 2", "indent_size = tab", "tab_width = 8"]
+
+
+class GetPropertyTest(unittest.TestCase):
+
+    def test_derived_values_match_resolve(self):
+        # Spread every combination of indentation options over two files
+        for near, far in itertools.product(
+                itertools.combinations(INDENT_OPTIONS, 2), repeat=2):
+            loader = MappingLoader({
+                '/a/.editorconfig': "[*]\n%s\n" % "\n".join(far),
+                '/a/b/.editorconfig': "[*.py]\n%s\n" % "\n".join(near),
+            })
+            resolver = Resolver(loader=loader, ceiling_directories=[])
+            options = resolver.resolve('/a/b/c.py')
+            for name in ("indent_style", "indent_size", "tab_width"):
+                self.assertEqual(
+                    resolver.get_property('/a/b/c.py', name),
+                    options.get(name), (near, far, name))
+
+    def test_stops_once_determined(self):
+        loader = RecordingLoader({
+            '/a/.editorconfig': "[*]\ncharset = latin1\ntab_width = 8\n",
+            '/a/b/.editorconfig': "[*]\ncharset = utf-8\nindent_size = 4\n",
+        })
+        resolver = Resolver(loader=loader, ceiling_directories=[])
+        self.assertEqual(resolver.get_property('/a/b/c', 'charset'), 'utf-8')
+        self.assertEqual(loader.read, ['/a/b/.editorconfig'])
+        # indent_size = 4 sets tab_width unless a farther file sets it
+        loader.read = []
+        self.assertEqual(resolver.get_property('/a/b/c', 'tab_width'), '8')
+        self.assertEqual(loader.read, ['/a/b/.editorconfig',
+                                       '/a/.editorconfig'])
+
+    def test_later_sections_win(self):
+        loader = MappingLoader({
+            '/a/.editorconfig': "root = true\n[*]\nend_of_line = CRLF\n"
+                                "[*.py]\nend_of_line = LF\n[*.txt]\n"
+                                "end_of_line = cr\n",
+        })
+        self.assertEqual(get_property('/a/b.py', 'End_Of_Line', loader),
+                         'lf')
+        self.assertEqual(get_property('/a/b.md', 'end_of_line', loader),
+                         'crlf')
+        self.assertIsNone(get_property('/a/b.md', 'charset', loader))
+
+
+class ResolverTest(unittest.TestCase):
+
+    def setUp(self):
+        self.files = {'/%d/.editorconfig' % i: "[*]\nindent_size = %d\n" % i
+                      for i in range(4)}
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(VersionError):
+            Resolver(version=(99, 0, 0, "final"))
+        with self.assertRaises(PathError):
+            Resolver(loader=MappingLoader({})).resolve('a.py')
+
+    def test_reparses_changed_files(self):
+        loader = MappingLoader(self.files)
+        resolver = Resolver(loader=loader)
+        self.assertEqual(resolver.get_property('/1/a', 'indent_size'), '1')
+        loader.files['/1/.editorconfig'] = "[*]\nindent_size = 9\n"
+        self.assertEqual(resolver.get_property('/1/a', 'indent_size'), '9')
+
+    def test_least_recently_used_evicted(self):
+        resolver = Resolver(loader=MappingLoader(self.files),
+                            ceiling_directories=['/'], max_cached_files=2)
+        with mock.patch('editorconfig.resolver.parse_config',
+                        wraps=parse_config) as parse:
+            for i in [0, 1, 0, 2, 0, 1]:
+                resolver.resolve('/%d/a' % i)
+        parsed = [call.args[1] for call in parse.call_args_list]
+        self.assertEqual(parsed, ['/0/.editorconfig', '/1/.editorconfig',
+                                  '/2/.editorconfig', '/1/.editorconfig'])
+        resolver.clear_cache()
+        with mock.patch('editorconfig.resolver.parse_config',
+                        wraps=parse_config) as parse:
+            resolver.resolve('/0/a')
+        self.assertEqual(parse.call_count, 1)
+
+    def test_threads(self):
+        files = {'/%d/%d/.editorconfig' % (i, j):
+                 "[*.py]\nindent_size = %d\n[*.c]\ntab_width = %d\n" % (i, j)
+                 for i in range(8) for j in range(8)}
+        paths = ['/%d/%d/x.%s' % (i, j, ext)
+                 for i in range(8) for j in range(8) for ext in ('py', 'c')]
+        expected = [dict(Resolver(loader=MappingLoader(files)).resolve(path))
+                    for path in paths]
+        resolver = Resolver(loader=MappingLoader(files), max_cached_files=16)
+        errors = []
+
+        def run():
+            for _ in range(20):
+                if [dict(resolver.resolve(path))
+                        for path in paths] != expected:
+                    errors.append(True)
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+
+class SearchLimitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.files = {
+            '/.editorconfig': "[*]\nend_of_line = lf\n",
+            '/r/.editorconfig': "[*]\ncharset = utf-8\n",
+            '/r/.git': "",
+            '/r/a/.editorconfig': "[*]\nindent_size = 2\n",
+        }
+
+    def resolve(self, **kwargs):
+        kwargs.setdefault('ceiling_directories', [])
+        resolver = Resolver(loader=MappingLoader(self.files), **kwargs)
+        return sorted(resolver.resolve('/r/a/b/c.txt'))
+
+    def test_ceiling_directories(self):
+        self.assertEqual(self.resolve(), ['charset', 'end_of_line',
+                                          'indent_size', 'tab_width'])
+        self.assertEqual(self.resolve(ceiling_directories=['/r']),
+                         ['charset', 'indent_size', 'tab_width'])
+        self.assertEqual(self.resolve(ceiling_directories=['/r/a/', '/r']),
+                         ['indent_size', 'tab_width'])
+        self.assertEqual(self.resolve(ceiling_directories=['/r/a/b/c']),
+                         ['charset', 'end_of_line', 'indent_size',
+                          'tab_width'])
+
+    def test_ceiling_directories_environment(self):
+        value = os.pathsep.join(['/r', 'relative', ''])
+        self.assertEqual(get_ceiling_directories(value),
+                         {os.path.normcase(os.path.normpath('/r'))})
+        with mock.patch.dict(os.environ,
+                             {'EDITORCONFIG_CEILING_DIRECTORIES': value}):
+            self.assertEqual(default_resolver().ceiling_directories,
+                             get_ceiling_directories(value))
+            self.assertEqual(self.resolve(ceiling_directories=None),
+                             ['charset', 'indent_size', 'tab_width'])
+        with mock.patch.dict(os.environ,
+                             {'EDITORCONFIG_CEILING_DIRECTORIES': ''}):
+            self.assertEqual(default_resolver().ceiling_directories,
+                             frozenset())
+
+    def test_stop_at_repository_root(self):
+        self.assertEqual(self.resolve(stop_at_repository_root=True),
+                         ['charset', 'indent_size', 'tab_width'])
+        del self.files['/r/.git']
+        self.assertEqual(self.resolve(stop_at_repository_root=True),
+                         ['charset', 'end_of_line', 'indent_size',
+                          'tab_width'])
+
+    def test_stop_at_repository_root_on_filesystem(self):
+        tree = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, tree)
+        os.makedirs(os.path.join(tree, 'repo', '.git'))
+        os.makedirs(os.path.join(tree, 'repo', 'sub'))
+        for directory, contents in [('', "[*]\nend_of_line = lf\n"),
+                                    ('repo', "[*]\ncharset = utf-8\n")]:
+            with open(os.path.join(tree, directory, '.editorconfig'),
+                      'w') as fp:
+                fp.write(contents)
+        filepath = os.path.join(tree, 'repo', 'sub', 'a.txt')
+        resolver = Resolver(ceiling_directories=[],
+                            stop_at_repository_root=True)
+        self.assertEqual(dict(resolver.resolve(filepath)),
+                         {'charset': 'utf-8'})
+        command = [sys.executable, '-m', 'editorconfig']
+        output = subprocess.run(
+            command + ['--ceiling', tree, filepath], check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        self.assertEqual(output.split(), ['end_of_line=lf', 'charset=utf-8'])
+        output = subprocess.run(
+            command + ['--stop-at-repo-root', filepath], check=True,
+            stdout=subprocess.PIPE, universal_newlines=True).stdout
+        self.assertEqual(output.split(), ['charset=utf-8'])
+
+
+class HandlerTest(unittest.TestCase):
+
+    def test_check_assertions(self):
+        with self.assertRaises(PathError):
+            EditorConfigHandler('a.py').check_assertions()
+        with self.assertRaises(VersionError):
+            EditorConfigHandler('/a.py',
+                                version=(99, 0, 0, "final")).check_assertions()
+        EditorConfigHandler('/a.py').check_assertions()
+
+    def test_preprocess_values(self):
+        handler = EditorConfigHandler('/a.py')
+        handler.options = OrderedDict([('indent_style', 'TAB')])
+        handler.preprocess_values()
+        self.assertEqual(dict(handler.options),
+                         {'indent_style': 'tab', 'indent_size': 'tab'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Unit tests for the EditorConfig shared memory cache
+
+Run with ``python -m unittest`` from the root of the project tree.
+
+Licensed under Simplified BSD License (see LICENSE.BSD file).
+
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from editorconfig.loaders import MappingLoader
+from editorconfig.resolver import Resolver, parse_config
+from editorconfig.shmcache import SharedMemoryCache
+
+
+CONFIG = "root = true\n[*.py]\nindent_size = 4\n"
+
+
+class SharedMemoryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SharedMemoryCache(size=1 << 16, slots=64)
+        self.addCleanup(self.cache.unlink)
+        self.addCleanup(self.cache.close)
+
+    def test_round_trip(self):
+        config = parse_config(CONFIG, '/a/.editorconfig')
+        self.assertIsNone(self.cache.get_config(CONFIG))
+        self.cache.set_config(CONFIG, config)
+        self.assertEqual(self.cache.get_config(CONFIG), config)
+        self.cache.set_chain('key', ('/a/.editorconfig',))
+        self.assertEqual(self.cache.get_chain('key'), ('/a/.editorconfig',))
+        self.assertIsNone(self.cache.get_chain('other'))
+
+    def test_invalidate(self):
+        self.cache.set_chain('key', ('/a/.editorconfig',))
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get_chain('key'))
+        self.cache.set_chain('key', ('/b/.editorconfig',))
+        self.assertEqual(self.cache.get_chain('key'), ('/b/.editorconfig',))
+
+    def test_full_segment(self):
+        for i in range(200):
+            self.cache.set_chain('key %d' % i, ('/%d/.editorconfig' % i,))
+        stored = [i for i in range(200)
+                  if self.cache.get_chain('key %d' % i) is not None]
+        self.assertEqual(stored, list(range(len(stored))))
+        self.assertLess(len(stored), 200)
+
+    def test_corrupt_entry_is_missing(self):
+        self.cache.set_chain('key', ('/a/.editorconfig',))
+        buf = self.cache.shm.buf
+        buf[self.cache._data_start + 8] ^= 0xff
+        self.assertIsNone(self.cache.get_chain('key'))
+
+    def test_incompatible_segment(self):
+        self.cache.shm.buf[4:6] = b'\xff\xff'
+        with self.assertRaises(ValueError):
+            SharedMemoryCache(self.cache.name, create=False)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires os.fork")
+    def test_shared_across_fork(self):
+        loader = MappingLoader({'/a/.editorconfig': CONFIG})
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                resolver = Resolver(loader=loader, ceiling_directories=[],
+                                    cache=self.cache)
+                if dict(resolver.resolve('/a/b/c.py'))['indent_size'] == '4':
+                    status = 0
+            finally:
+                os._exit(status)
+        self.assertEqual(os.waitpid(pid, 0)[1], 0)
+        self.assertEqual(self.cache.get_config(CONFIG),
+                         parse_config(CONFIG, '/a/.editorconfig'))
+        self.assertEqual(self.cache.get_chain(
+            Resolver(ceiling_directories=[])._chain_prefix + '/a/b'),
+            ('/a/.editorconfig',))
+
+    def test_attached_process_keeps_segment(self):
+        self.cache.set_chain('key', ('/a/.editorconfig',))
+        code = ("from editorconfig.shmcache import SharedMemoryCache\n"
+                "cache = SharedMemoryCache(%r, create=False)\n"
+                "print(cache.get_chain('key'))\n"
+                "cache.set_chain('other', ())\n"
+                "cache.close()\n" % self.cache.name)
+        output = subprocess.run([sys.executable, '-c', code], check=True,
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+        self.assertEqual(output, "('/a/.editorconfig',)\n")
+        # Without the lock the attached process could not store anything
+        self.assertIsNone(self.cache.get_chain('other'))
+        self.assertEqual(bytes(self.cache.shm.buf[:4]), b'ECSC')
+        attached = SharedMemoryCache(self.cache.name, create=False)
+        attached.close()
+
+
+if __name__ == '__main__':
+    unittest.main()